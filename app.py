@@ -1,18 +1,32 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import sqlite3
-import openai
-from sqlalchemy import create_engine, text
 import os
 from dotenv import load_dotenv
 import io
 import json
 from typing import Dict, List, Any, Optional
 import re
+import asyncio
+import html
+import warnings
+
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
+
+# Upper bound on rows sent to the browser for point-based charts
+MAX_PLOT_POINTS = 50_000
+
+# Rows handed to the Data View grid; keeps the Arrow payload well under Streamlit's message limit
+MAX_PREVIEW_ROWS = 100_000
+
+# Largest categories drawn as pie slices; the remainder is grouped into "Other"
+MAX_PIE_SLICES = 15
+
+# Rows drawn in each panel of the automatic scatter matrix
+MAX_SPLOM_POINTS = 5_000
 
 # Load environment variables
 load_dotenv()
@@ -68,23 +82,160 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def _read_csv_arrow(file):
+    """Read a CSV with the multithreaded Arrow parser, keeping the C engine's column types"""
+    data = pd.read_csv(file, engine="pyarrow")
+    
+    # Arrow infers ISO dates, times and timestamps where the C engine keeps text, and reads
+    # all-empty columns as None instead of NaN; re-read just those columns with the C engine
+    # so the schema does not depend on which parser succeeded
+    reread = [
+        i for i, (_, col) in enumerate(data.items())
+        if pd.api.types.is_datetime64_any_dtype(col)
+        or pd.api.types.infer_dtype(col, skipna=True) in ("date", "time", "empty")
+    ]
+    if reread:
+        file.seek(0)
+        c_cols = pd.read_csv(file, usecols=reread)
+        for j, i in enumerate(reread):
+            data.isetitem(i, c_cols.iloc[:, j])
+    return data
+
+def _fp(df):
+    """Cheap dataset fingerprint for cache keys: shape, columns and a hash of the leading rows"""
+    head = df.head(1024)
+    try:
+        digest = pd.util.hash_pandas_object(head, index=False).sum()
+    except (TypeError, ValueError):
+        # Unhashable cells such as lists or dicts from JSON/array columns; hash their text form
+        digest = pd.util.hash_pandas_object(head.astype(str), index=False).sum()
+    return (df.shape, tuple(df.columns), int(digest))
+
+@st.cache_data(show_spinner=False)
+def _compute_data_stats(_data, data_name, fingerprint):
+    """Compute the full-scan statistics; cached per dataset fingerprint across reruns"""
+    return {
+        "null_counts": _data.isnull().sum(),
+        "numeric_summary": _data.describe() if len(_data.select_dtypes(include=[np.number]).columns) > 0 else pd.DataFrame()
+    }
+
+@st.cache_data(show_spinner=False)
+def _corr(fingerprint, cols, _data):
+    """Correlation matrix of a numeric block, computed with BLAS-backed np.corrcoef"""
+    # Boolean column mask rather than label lookup, so duplicate labels (e.g. SQL joins) are taken once
+    block = _data.loc[:, _data.columns.isin(cols)]
+    # Contiguous float32 halves memory traffic and lets BLAS use wider SIMD lanes
+    arr = np.ascontiguousarray(block.to_numpy(dtype=np.float32, na_value=np.nan))
+    if np.isnan(arr).any():
+        # np.corrcoef has no pairwise NaN handling, so fill gaps with the column mean
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            means = np.nanmean(arr, axis=0)
+        arr = np.where(np.isnan(arr), means, arr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.corrcoef(arr, rowvar=False, dtype=np.float32)
+    return pd.DataFrame(corr, index=block.columns, columns=block.columns)
+
+@st.cache_data(show_spinner=False)
+def _sample_data(n=100):
+    """Build the synthetic sales dataset; generated once per size"""
+    np.random.seed(42)
+    return pd.DataFrame({
+        'Date': pd.date_range('2024-01-01', periods=n, freq='D'),
+        'Product': np.random.choice(['Product A', 'Product B', 'Product C'], n),
+        'Sales': np.random.randint(100, 1000, n),
+        'Region': np.random.choice(['North', 'South', 'East', 'West'], n),
+        'Customer_Satisfaction': np.random.uniform(3.0, 5.0, n)
+    })
+
+def _count_outliers_loop(arr, lo, hi, out):
+    """Count values outside [lo, hi] per column in one fused serial pass"""
+    for j in range(arr.shape[1]):
+        c = 0
+        l = lo[j]
+        h = hi[j]
+        for i in range(arr.shape[0]):
+            v = arr[i, j]
+            if v < l or v > h:
+                c += 1
+        out[j] = c
+
+def _count_outliers_numpy(arr, lo, hi, out):
+    """Count values outside [lo, hi] per column"""
+    with np.errstate(invalid="ignore"):
+        out[:] = ((arr < lo) | (arr > hi)).sum(axis=0)
+
+_count_outliers = None
+
+def _outlier_counter():
+    """Outlier counting kernel, compiled with Numba on first use when it is installed"""
+    global _count_outliers
+    if _count_outliers is None:
+        # Serial on purpose: Streamlit calls this from per-session threads, which Numba's
+        # parallel threading layers do not support safely
+        try:
+            from numba import njit
+        except ImportError:
+            _count_outliers = _count_outliers_numpy
+        else:
+            _count_outliers = njit(cache=True)(_count_outliers_loop)
+    return _count_outliers
+
+@st.cache_data(show_spinner=False)
+def _outliers(fingerprint, cols, _data):
+    """Count IQR outliers per numeric column"""
+    # Quantiles once, then a fused compare-and-count pass per column; the boolean mask keeps
+    # duplicate labels (e.g. SQL joins) aligned with their counts
+    block = _data.loc[:, _data.columns.isin(cols)]
+    arr = block.to_numpy(dtype=float, na_value=np.nan)
+    q = np.nanquantile(arr, [0.25, 0.75], axis=0)
+    iqr = q[1] - q[0]
+    counts = np.zeros(arr.shape[1], dtype=np.int64)
+    _outlier_counter()(arr, q[0] - 1.5*iqr, q[1] + 1.5*iqr, counts)
+    return dict(zip(block.columns, counts.tolist()))
+
 class DataAnalyst:
     def __init__(self):
         self.data = None
         self.data_name = ""
         self.engine = None
+        self._conn_str = None
         self.openai_client = None
         self.chat_history = []
+        self._stats_cache = {}
         
         # Initialize OpenAI client
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key:
+            import openai
             self.openai_client = openai.OpenAI(api_key=api_key)
     
-    def load_csv_data(self, file):
-        """Load data from CSV file"""
+    @property
+    def data(self):
+        """The loaded DataFrame"""
+        return self._data
+    
+    @data.setter
+    def data(self, value):
+        self._data = value
+        if value is not None:
+            self._refresh_schema()
+        else:
+            self.numeric_cols = []
+            self.all_cols = []
+    
+    def load_csv_data(self, file, chunksize=None):
+        """Load data from CSV file, optionally streaming it in chunks"""
         try:
-            self.data = pd.read_csv(file)
+            if chunksize:
+                self.data = pd.concat(pd.read_csv(file, chunksize=chunksize), ignore_index=True)
+            else:
+                try:
+                    # Multithreaded Arrow parser; fall back to the default engine on failure
+                    self.data = _read_csv_arrow(file)
+                except Exception:
+                    file.seek(0)
+                    self.data = pd.read_csv(file)
             self.data_name = file.name
             return True, f"Successfully loaded {len(self.data)} rows from {file.name}"
         except Exception as e:
@@ -101,23 +252,30 @@ class DataAnalyst:
     
     def connect_database(self, db_type, connection_params):
         """Connect to database"""
+        from sqlalchemy import create_engine, text
+        
         try:
+            # Driver-less URL kept for connectorx; SQLite queries stay on pandas
+            conn_str = None
             if db_type == "SQLite":
                 self.engine = create_engine(f"sqlite:///{connection_params['database']}")
             elif db_type == "PostgreSQL":
-                self.engine = create_engine(
+                conn_str = (
                     f"postgresql://{connection_params['user']}:{connection_params['password']}@"
                     f"{connection_params['host']}:{connection_params['port']}/{connection_params['database']}"
                 )
+                self.engine = create_engine(conn_str)
             elif db_type == "MySQL":
-                self.engine = create_engine(
-                    f"mysql+pymysql://{connection_params['user']}:{connection_params['password']}@"
+                conn_str = (
+                    f"mysql://{connection_params['user']}:{connection_params['password']}@"
                     f"{connection_params['host']}:{connection_params['port']}/{connection_params['database']}"
                 )
+                self.engine = create_engine(conn_str.replace("mysql://", "mysql+pymysql://", 1))
             
             # Test connection
             with self.engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
+            self._conn_str = conn_str
             
             return True, f"Successfully connected to {db_type} database"
         except Exception as e:
@@ -127,7 +285,14 @@ class DataAnalyst:
         """Execute SQL query"""
         try:
             if self.engine:
-                self.data = pd.read_sql(query, self.engine)
+                if cx is not None and self._conn_str:
+                    try:
+                        # Rows land directly in columnar buffers instead of DBAPI tuples
+                        self.data = cx.read_sql(self._conn_str, query, return_type="pandas")
+                    except Exception:
+                        self.data = pd.read_sql(query, self.engine)
+                else:
+                    self.data = pd.read_sql(query, self.engine)
                 self.data_name = "SQL Query Result"
                 return True, f"Query executed successfully. Retrieved {len(self.data)} rows."
             else:
@@ -135,19 +300,85 @@ class DataAnalyst:
         except Exception as e:
             return False, f"Query execution error: {str(e)}"
     
-    def get_data_info(self):
-        """Get basic information about the loaded data"""
+    def _refresh_schema(self):
+        """Cache column lists after the data changes so reruns skip dtype introspection"""
+        self.numeric_cols = self.data.select_dtypes(include=[np.number]).columns.tolist()
+        self.all_cols = self.data.columns.tolist()
+    
+    def get_data_schema(self):
+        """Get shape, columns and dtypes of the loaded data (metadata only, no scans)"""
         if self.data is None:
             return "No data loaded"
         
-        info = {
+        return {
             "shape": self.data.shape,
             "columns": self.data.columns.tolist(),
-            "dtypes": self.data.dtypes.to_dict(),
-            "null_counts": self.data.isnull().sum().to_dict(),
-            "numeric_summary": self.data.describe().to_dict() if len(self.data.select_dtypes(include=[np.number]).columns) > 0 else {}
+            "dtypes": self.data.dtypes.to_dict()
         }
-        return info
+    
+    def get_data_stats(self):
+        """Get null counts and the numeric summary of the loaded data"""
+        if self.data is None:
+            return "No data loaded"
+        
+        # Reruns with unchanged data reuse the previous result
+        fingerprint = _fp(self.data)
+        key = (fingerprint, self.data_name)
+        stats = self._stats_cache.get(key)
+        if stats is None:
+            stats = _compute_data_stats(self.data, self.data_name, fingerprint)
+            self._stats_cache = {key: stats}
+        return stats
+    
+    def get_data_info(self):
+        """Get basic information about the loaded data"""
+        if self.data is None:
+            return "No data loaded"
+        
+        stats = self.get_data_stats()
+        return {
+            **self.get_data_schema(),
+            "null_counts": stats["null_counts"].to_dict(),
+            "numeric_summary": stats["numeric_summary"].to_dict()
+        }
+    
+    def _chat_request(self, user_message):
+        """Build chat completion arguments with context about the loaded data"""
+        # Prepare context about the data
+        data_context = ""
+        if self.data is not None:
+            data_info = self.get_data_schema()
+            data_context = f"""
+            Current dataset: {self.data_name}
+            Shape: {data_info['shape']}
+            Columns: {data_info['columns']}
+            Data types: {data_info['dtypes']}
+            """
+        
+        # Create system message
+        system_message = f"""
+        You are an AI data analyst assistant. You help users analyze their data and answer questions about it.
+        {data_context}
+        
+        When users ask about data analysis:
+        1. Provide clear, actionable insights
+        2. Suggest relevant SQL queries when appropriate
+        3. Recommend visualizations
+        4. Explain your reasoning
+        5. Be concise but thorough
+        
+        If users want to create charts, suggest specific chart types and the columns to use.
+        """
+        
+        return dict(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_message}
+            ],
+            max_tokens=1000,
+            temperature=0.7
+        )
     
     def generate_ai_response(self, user_message):
         """Generate AI response using OpenAI"""
@@ -155,64 +386,87 @@ class DataAnalyst:
             return "OpenAI API key not configured. Please add your API key to use AI features."
         
         try:
-            # Prepare context about the data
-            data_context = ""
-            if self.data is not None:
-                data_info = self.get_data_info()
-                data_context = f"""
-                Current dataset: {self.data_name}
-                Shape: {data_info['shape']}
-                Columns: {data_info['columns']}
-                Data types: {data_info['dtypes']}
-                """
-            
-            # Create system message
-            system_message = f"""
-            You are an AI data analyst assistant. You help users analyze their data and answer questions about it.
-            {data_context}
-            
-            When users ask about data analysis:
-            1. Provide clear, actionable insights
-            2. Suggest relevant SQL queries when appropriate
-            3. Recommend visualizations
-            4. Explain your reasoning
-            5. Be concise but thorough
-            
-            If users want to create charts, suggest specific chart types and the columns to use.
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": user_message}
-                ],
-                max_tokens=1000,
-                temperature=0.7
-            )
-            
+            response = self.openai_client.chat.completions.create(**self._chat_request(user_message))
             return response.choices[0].message.content
         except Exception as e:
             return f"AI response error: {str(e)}"
     
+    def stream_ai_response(self, user_message):
+        """Yield the AI response incrementally, for use with st.write_stream"""
+        if not self.openai_client:
+            yield "OpenAI API key not configured. Please add your API key to use AI features."
+            return
+        
+        try:
+            stream = self.openai_client.chat.completions.create(**self._chat_request(user_message), stream=True)
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            yield f"AI response error: {str(e)}"
+    
+    def generate_ai_responses_batch(self, messages):
+        """Generate AI responses for several prompts concurrently"""
+        if not self.openai_client:
+            return ["OpenAI API key not configured. Please add your API key to use AI features."] * len(messages)
+        
+        import openai
+        
+        # Mirror the configured client so the batch hits the same endpoint with the same settings
+        sync_client = self.openai_client
+        client_settings = dict(
+            api_key=sync_client.api_key,
+            organization=sync_client.organization,
+            base_url=sync_client.base_url,
+            timeout=sync_client.timeout,
+            max_retries=sync_client.max_retries,
+            default_headers=sync_client._custom_headers,
+            default_query=sync_client._custom_query,
+        )
+        
+        async def _gather():
+            # The async client is bound to the event loop, so it lives only as long as this batch
+            async with openai.AsyncOpenAI(**client_settings) as client:
+                async def _agen(message):
+                    response = await client.chat.completions.create(**self._chat_request(message))
+                    return response.choices[0].message.content
+                return await asyncio.gather(*[_agen(m) for m in messages], return_exceptions=True)
+        
+        results = asyncio.run(_gather())
+        return [f"AI response error: {str(r)}" if isinstance(r, Exception) else r for r in results]
+    
     def create_visualization(self, chart_type, x_col, y_col, title=""):
         """Create visualizations using Plotly"""
         if self.data is None:
             return None
         
+        import plotly.express as px
+        
         try:
+            # Large frames are downsampled so the browser never renders more than MAX_PLOT_POINTS points
+            large = len(self.data) > MAX_PLOT_POINTS
+            
             if chart_type == "Bar Chart":
                 fig = px.bar(self.data, x=x_col, y=y_col, title=title)
             elif chart_type == "Line Chart":
-                fig = px.line(self.data, x=x_col, y=y_col, title=title)
+                # Stride sampling keeps the row order and overall shape of the series
+                step = -(-len(self.data) // MAX_PLOT_POINTS)
+                plot_data = self.data.iloc[::step] if large else self.data
+                fig = px.line(plot_data, x=x_col, y=y_col, title=title, render_mode="webgl")
             elif chart_type == "Scatter Plot":
-                fig = px.scatter(self.data, x=x_col, y=y_col, title=title)
+                plot_data = self.data.sample(MAX_PLOT_POINTS, random_state=0) if large else self.data
+                fig = px.scatter(plot_data, x=x_col, y=y_col, title=title, render_mode="webgl")
             elif chart_type == "Histogram":
                 fig = px.histogram(self.data, x=x_col, title=title)
             elif chart_type == "Box Plot":
                 fig = px.box(self.data, y=y_col, title=title)
             elif chart_type == "Pie Chart":
-                value_counts = self.data[x_col].value_counts()
+                # Unsorted counts plus a top-K selection avoid sorting every category
+                counts = self.data[x_col].value_counts(sort=False)
+                value_counts = counts.nlargest(MAX_PIE_SLICES)
+                other = counts.sum() - value_counts.sum()
+                if other:
+                    value_counts = pd.concat([value_counts, pd.Series({"Other": other})])
                 fig = px.pie(values=value_counts.values, names=value_counts.index, title=title)
             else:
                 return None
@@ -307,23 +561,14 @@ def main():
         
         elif data_source == "Sample Data":
             if st.button("Load Sample Sales Data"):
-                # Create sample data
-                np.random.seed(42)
-                sample_data = pd.DataFrame({
-                    'Date': pd.date_range('2024-01-01', periods=100, freq='D'),
-                    'Product': np.random.choice(['Product A', 'Product B', 'Product C'], 100),
-                    'Sales': np.random.randint(100, 1000, 100),
-                    'Region': np.random.choice(['North', 'South', 'East', 'West'], 100),
-                    'Customer_Satisfaction': np.random.uniform(3.0, 5.0, 100)
-                })
-                analyst.data = sample_data
+                analyst.data = _sample_data()
                 analyst.data_name = "Sample Sales Data"
                 st.success("Sample data loaded successfully!")
         
         # Data overview
         if analyst.data is not None:
             st.header("📊 Data Overview")
-            data_info = analyst.get_data_info()
+            data_info = analyst.get_data_schema()
             
             st.markdown(f"""
             <div class="data-info">
@@ -334,9 +579,11 @@ def main():
             """, unsafe_allow_html=True)
             
             with st.expander("Column Details"):
-                for col, dtype in data_info['dtypes'].items():
-                    null_count = data_info['null_counts'][col]
-                    st.write(f"**{col}**: {dtype} ({null_count} nulls)")
+                schema_df = pd.DataFrame({
+                    "dtype": analyst.data.dtypes.astype(str),
+                    "nulls": analyst.get_data_stats()['null_counts']
+                })
+                st.dataframe(schema_df, use_container_width=True)
     
     # Main content area
     col1, col2 = st.columns([2, 1])
@@ -353,9 +600,14 @@ def main():
             
             # Display chat history
             with chat_container:
-                for i, (user_msg, ai_msg) in enumerate(st.session_state.chat_history):
-                    st.markdown(f'<div class="chat-message user-message"><strong>You:</strong> {user_msg}</div>', unsafe_allow_html=True)
-                    st.markdown(f'<div class="chat-message ai-message"><strong>AI:</strong> {ai_msg}</div>', unsafe_allow_html=True)
+                # One markdown element for the whole history instead of two per message
+                history_html = "".join(
+                    f'<div class="chat-message user-message"><strong>You:</strong> {html.escape(user_msg)}</div>'
+                    f'<div class="chat-message ai-message"><strong>AI:</strong> {html.escape(ai_msg)}</div>'
+                    for user_msg, ai_msg in st.session_state.chat_history
+                )
+                if history_html:
+                    st.markdown(history_html, unsafe_allow_html=True)
             
             # Chat input
             user_input = st.text_input("Ask me anything about your data:", key="chat_input")
@@ -365,7 +617,8 @@ def main():
             with col_send:
                 if st.button("Send", key="send_chat"):
                     if user_input and analyst.data is not None:
-                        ai_response = analyst.generate_ai_response(user_input)
+                        with chat_container:
+                            ai_response = st.write_stream(analyst.stream_ai_response(user_input))
                         st.session_state.chat_history.append((user_input, ai_response))
                         st.rerun()
                     elif user_input and analyst.data is None:
@@ -419,6 +672,8 @@ SELECT AVG(column1), MAX(column2) FROM table_name;
             st.header("Data Visualizations")
             
             if analyst.data is not None:
+                import plotly.express as px
+                
                 col_chart, col_settings = st.columns([2, 1])
                 
                 with col_settings:
@@ -427,8 +682,8 @@ SELECT AVG(column1), MAX(column2) FROM table_name;
                         ["Bar Chart", "Line Chart", "Scatter Plot", "Histogram", "Box Plot", "Pie Chart"]
                     )
                     
-                    numeric_cols = analyst.data.select_dtypes(include=[np.number]).columns.tolist()
-                    all_cols = analyst.data.columns.tolist()
+                    numeric_cols = analyst.numeric_cols
+                    all_cols = analyst.all_cols
                     
                     if chart_type in ["Bar Chart", "Line Chart", "Scatter Plot"]:
                         x_col = st.selectbox("X-axis", all_cols)
@@ -457,7 +712,7 @@ SELECT AVG(column1), MAX(column2) FROM table_name;
                         # Correlation heatmap
                         if len(numeric_cols) > 1:
                             fig_corr = px.imshow(
-                                analyst.data[numeric_cols].corr(),
+                                _corr(_fp(analyst.data), tuple(numeric_cols), analyst.data),
                                 title="Correlation Heatmap",
                                 color_continuous_scale="RdBu_r"
                             )
@@ -481,7 +736,7 @@ SELECT AVG(column1), MAX(column2) FROM table_name;
             if analyst.data is not None:
                 # Data preview
                 st.subheader("Data Preview")
-                st.dataframe(analyst.data.head(20), use_container_width=True)
+                st.dataframe(analyst.data.head(MAX_PREVIEW_ROWS), use_container_width=True, height=400)
                 
                 # Download data
                 csv = analyst.data.to_csv(index=False)
@@ -493,13 +748,14 @@ SELECT AVG(column1), MAX(column2) FROM table_name;
                 )
                 
                 # Statistical summary
-                if len(analyst.data.select_dtypes(include=[np.number]).columns) > 0:
+                if analyst.numeric_cols:
                     st.subheader("Statistical Summary")
-                    st.dataframe(analyst.data.describe(), use_container_width=True)
+                    st.dataframe(analyst.get_data_stats()['numeric_summary'], use_container_width=True)
                 
                 # Missing values
                 st.subheader("Missing Values")
-                missing_data = analyst.data.isnull().sum()
+                # Reuse the cached per-column null counts instead of rescanning the frame
+                missing_data = analyst.get_data_stats()['null_counts']
                 missing_data = missing_data[missing_data > 0]
                 if len(missing_data) > 0:
                     st.dataframe(missing_data.to_frame("Missing Count"), use_container_width=True)
@@ -526,25 +782,23 @@ SELECT AVG(column1), MAX(column2) FROM table_name;
                     st.warning("OpenAI API key required for AI summary")
             
             if st.button("🔍 Find Outliers"):
-                numeric_cols = analyst.data.select_dtypes(include=[np.number]).columns
+                numeric_cols = analyst.numeric_cols
                 if len(numeric_cols) > 0:
-                    outliers_info = {}
-                    for col in numeric_cols:
-                        Q1 = analyst.data[col].quantile(0.25)
-                        Q3 = analyst.data[col].quantile(0.75)
-                        IQR = Q3 - Q1
-                        outliers = analyst.data[(analyst.data[col] < Q1 - 1.5*IQR) | (analyst.data[col] > Q3 + 1.5*IQR)]
-                        outliers_info[col] = len(outliers)
-                    
+                    outliers_info = _outliers(_fp(analyst.data), tuple(numeric_cols), analyst.data)
                     st.json(outliers_info)
                 else:
                     st.info("No numeric columns for outlier detection")
             
             if st.button("📈 Auto-Visualize"):
-                numeric_cols = analyst.data.select_dtypes(include=[np.number]).columns
+                numeric_cols = analyst.numeric_cols
                 if len(numeric_cols) >= 2:
-                    # Create automatic correlation plot
-                    fig = px.scatter_matrix(analyst.data[numeric_cols[:4]], title="Automatic Correlation Matrix")
+                    import plotly.express as px
+                    
+                    # Create automatic correlation plot from a bounded sample, drawn once per panel
+                    sub = analyst.data[numeric_cols[:4]]
+                    if len(sub) > MAX_SPLOM_POINTS:
+                        sub = sub.sample(MAX_SPLOM_POINTS, random_state=0)
+                    fig = px.scatter_matrix(sub, title="Automatic Correlation Matrix")
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("Need at least 2 numeric columns for auto-visualization")
@@ -564,6 +818,7 @@ SELECT AVG(column1), MAX(column2) FROM table_name;
             if st.button("Update API Key"):
                 if api_key_input and api_key_input != "***":
                     os.environ["OPENAI_API_KEY"] = api_key_input
+                    import openai
                     analyst.openai_client = openai.OpenAI(api_key=api_key_input)
                     st.success("API key updated!")
                     st.rerun()
@@ -2,12 +2,19 @@
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+
+_MONTH_NAMES = np.array(['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                         'August', 'September', 'October', 'November', 'December'])
+
+def _categorical(rng, values, n, p=None):
+    """Draw n values from values (uniformly, or with probabilities p) as a Categorical built straight from integer codes"""
+    codes = rng.integers(0, len(values), n) if p is None else rng.choice(len(values), n, p=p)
+    return pd.Categorical.from_codes(codes, categories=values)
 
 def generate_sales_data(num_records=1000):
     """Generate sample sales data"""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     # Generate date range
     start_date = datetime(2023, 1, 1)
@@ -21,30 +28,38 @@ def generate_sales_data(num_records=1000):
     
     data = {
         'Date': dates,
-        'Product': np.random.choice(products, num_records),
-        'Category': np.random.choice(categories, num_records),
-        'Region': np.random.choice(regions, num_records),
-        'Sales_Amount': np.random.uniform(100, 5000, num_records).round(2),
-        'Quantity': np.random.randint(1, 50, num_records),
-        'Customer_Rating': np.random.uniform(1, 5, num_records).round(1),
-        'Sales_Rep': [f'Rep_{i:03d}' for i in np.random.randint(1, 51, num_records)],
-        'Discount_Percent': np.random.uniform(0, 30, num_records).round(1)
+        'Product': _categorical(rng, products, num_records),
+        'Category': _categorical(rng, categories, num_records),
+        'Region': _categorical(rng, regions, num_records),
+        'Sales_Amount': rng.uniform(100, 5000, num_records).round(2),
+        'Quantity': rng.integers(1, 50, num_records),
+        'Customer_Rating': rng.uniform(1, 5, num_records).round(1),
+        'Sales_Rep': np.char.add('Rep_', np.char.zfill(rng.integers(1, 51, num_records).astype(str), 3)),
+        'Discount_Percent': rng.uniform(0, 30, num_records).round(1)
     }
     
-    df = pd.DataFrame(data)
-    
-    # Add calculated fields
-    df['Revenue'] = df['Sales_Amount'] * df['Quantity']
-    df['Discounted_Revenue'] = df['Revenue'] * (1 - df['Discount_Percent'] / 100)
-    df['Month'] = df['Date'].dt.month_name()
-    df['Year'] = df['Date'].dt.year
-    df['Quarter'] = df['Date'].dt.quarter
-    
-    return df
+    # Add calculated fields on the raw arrays, reusing one buffer for the discounted revenue
+    revenue = data['Sales_Amount'] * data['Quantity']
+    disc_rev = data['Discount_Percent'] / -100
+    disc_rev += 1
+    disc_rev *= revenue
+    data['Revenue'] = revenue
+    data['Discounted_Revenue'] = disc_rev
+    
+    # Derive calendar fields from the raw datetime64 buffer in a single traversal
+    dt_arr = dates.to_numpy()
+    years = dt_arr.astype('datetime64[Y]')
+    month = (dt_arr.astype('datetime64[M]') - years).astype(np.int32) + 1
+    data['Month'] = _MONTH_NAMES[month - 1]
+    data['Year'] = years.astype(np.int32) + 1970
+    data['Quarter'] = (month - 1) // 3 + 1
+    
+    # Construct the frame once from the complete column mapping
+    return pd.DataFrame(data)
 
 def generate_customer_data(num_records=500):
     """Generate sample customer data"""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     first_names = ['John', 'Jane', 'Michael', 'Sarah', 'David', 'Emily', 'Robert', 'Lisa', 
                    'William', 'Jennifer', 'James', 'Mary', 'Christopher', 'Patricia']
@@ -57,38 +72,46 @@ def generate_customer_data(num_records=500):
     industries = ['Technology', 'Healthcare', 'Finance', 'Education', 'Manufacturing', 
                   'Retail', 'Real Estate', 'Transportation']
     
+    # Build string columns with vectorized numpy string ops instead of per-row f-strings
+    customer_ids = np.char.add('CUST_', np.char.zfill(np.arange(1, num_records + 1).astype(str), 4))
+    first_name = np.asarray(first_names)[rng.integers(0, len(first_names), num_records)]
+    last_name = np.asarray(last_names)[rng.integers(0, len(last_names), num_records)]
+    # Emails reuse the drawn names so they match the customer's name columns
+    emails = np.char.add(
+        np.char.add(np.char.lower(first_name), '.'),
+        np.char.add(np.char.lower(last_name), '@email.com')
+    )
+    
     data = {
-        'Customer_ID': [f'CUST_{i:04d}' for i in range(1, num_records + 1)],
-        'First_Name': np.random.choice(first_names, num_records),
-        'Last_Name': np.random.choice(last_names, num_records),
-        'Email': [f'{fn.lower()}.{ln.lower()}@email.com' 
-                  for fn, ln in zip(np.random.choice(first_names, num_records),
-                                   np.random.choice(last_names, num_records))],
-        'Age': np.random.randint(18, 80, num_records),
-        'City': np.random.choice(cities, num_records),
-        'Industry': np.random.choice(industries, num_records),
-        'Annual_Income': np.random.normal(75000, 25000, num_records).round(0),
-        'Years_Customer': np.random.randint(1, 15, num_records),
-        'Total_Purchases': np.random.randint(1, 100, num_records),
-        'Last_Purchase_Days_Ago': np.random.randint(1, 365, num_records),
-        'Preferred_Contact': np.random.choice(['Email', 'Phone', 'SMS'], num_records),
-        'Customer_Status': np.random.choice(['Active', 'Inactive', 'VIP'], num_records, 
-                                          p=[0.7, 0.2, 0.1])
+        'Customer_ID': customer_ids,
+        'First_Name': first_name,
+        'Last_Name': last_name,
+        'Email': emails,
+        'Age': rng.integers(18, 80, num_records),
+        'City': _categorical(rng, cities, num_records),
+        'Industry': _categorical(rng, industries, num_records),
+        'Annual_Income': rng.normal(75000, 25000, num_records).round(0),
+        'Years_Customer': rng.integers(1, 15, num_records),
+        'Total_Purchases': rng.integers(1, 100, num_records),
+        'Last_Purchase_Days_Ago': rng.integers(1, 365, num_records),
+        'Preferred_Contact': _categorical(rng, ['Email', 'Phone', 'SMS'], num_records),
+        'Customer_Status': _categorical(rng, ['Active', 'Inactive', 'VIP'], num_records, 
+                                        p=[0.7, 0.2, 0.1])
     }
     
-    df = pd.DataFrame(data)
-    
     # Ensure positive income
-    df['Annual_Income'] = df['Annual_Income'].abs()
+    annual_income = np.abs(data['Annual_Income'])
+    data['Annual_Income'] = annual_income
     
     # Add customer lifetime value calculation
-    df['Customer_Lifetime_Value'] = (df['Total_Purchases'] * df['Annual_Income'] * 0.001).round(2)
+    data['Customer_Lifetime_Value'] = (data['Total_Purchases'] * annual_income * 0.001).round(2)
     
-    return df
+    # Construct the frame once from the complete column mapping
+    return pd.DataFrame(data)
 
 def generate_inventory_data(num_records=200):
     """Generate sample inventory data"""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     products = ['Laptop Pro 15"', 'Smartphone X', 'Tablet Ultra', 'Wireless Headphones',
                 '4K Monitor', 'Mechanical Keyboard', 'Gaming Mouse', 'USB-C Hub',
@@ -98,33 +121,41 @@ def generate_inventory_data(num_records=200):
     warehouses = ['Warehouse A', 'Warehouse B', 'Warehouse C', 'Warehouse D']
     
     data = {
-        'Product_ID': [f'PROD_{i:04d}' for i in range(1, num_records + 1)],
-        'Product_Name': np.random.choice(products, num_records),
-        'Supplier': np.random.choice(suppliers, num_records),
-        'Warehouse': np.random.choice(warehouses, num_records),
-        'Current_Stock': np.random.randint(0, 500, num_records),
-        'Reorder_Level': np.random.randint(10, 50, num_records),
-        'Max_Stock': np.random.randint(200, 1000, num_records),
-        'Unit_Cost': np.random.uniform(10, 2000, num_records).round(2),
-        'Selling_Price': np.random.uniform(15, 3000, num_records).round(2),
+        'Product_ID': np.char.add('PROD_', np.char.zfill(np.arange(1, num_records + 1).astype(str), 4)),
+        'Product_Name': _categorical(rng, products, num_records),
+        'Supplier': _categorical(rng, suppliers, num_records),
+        'Warehouse': _categorical(rng, warehouses, num_records),
+        'Current_Stock': rng.integers(0, 500, num_records),
+        'Reorder_Level': rng.integers(10, 50, num_records),
+        'Max_Stock': rng.integers(200, 1000, num_records),
+        'Unit_Cost': rng.uniform(10, 2000, num_records).round(2),
+        'Selling_Price': rng.uniform(15, 3000, num_records).round(2),
         'Last_Restocked': pd.date_range('2024-01-01', '2024-12-31', periods=num_records),
         'Expiry_Date': pd.date_range('2025-01-01', '2027-12-31', periods=num_records),
-        'Category': np.random.choice(['Electronics', 'Accessories', 'Components'], num_records)
+        'Category': _categorical(rng, ['Electronics', 'Accessories', 'Components'], num_records)
     }
     
-    df = pd.DataFrame(data)
+    unit_cost = data['Unit_Cost']
+    current_stock = data['Current_Stock']
     
     # Ensure selling price > unit cost
-    df['Selling_Price'] = np.maximum(df['Selling_Price'], df['Unit_Cost'] * 1.2)
+    selling_price = np.maximum(data['Selling_Price'], unit_cost * 1.2)
+    data['Selling_Price'] = selling_price
     
     # Add calculated fields
-    df['Profit_Margin'] = ((df['Selling_Price'] - df['Unit_Cost']) / df['Selling_Price'] * 100).round(2)
-    df['Stock_Value'] = (df['Current_Stock'] * df['Unit_Cost']).round(2)
-    df['Days_Since_Restock'] = (datetime.now() - df['Last_Restocked']).dt.days
-    df['Stock_Status'] = np.where(df['Current_Stock'] <= df['Reorder_Level'], 'Low Stock',
-                                np.where(df['Current_Stock'] >= df['Max_Stock'] * 0.9, 'Overstocked', 'Normal'))
-    
-    return df
+    data['Profit_Margin'] = ((selling_price - unit_cost) / selling_price * 100).round(2)
+    data['Stock_Value'] = (current_stock * unit_cost).round(2)
+    now64 = np.datetime64(datetime.now())
+    data['Days_Since_Restock'] = ((now64 - data['Last_Restocked'].to_numpy()) // np.timedelta64(1, 'D')).astype(np.int32)
+    
+    # Stock status as int8 codes; low stock is written last so it wins over overstocked
+    status_codes = np.zeros(num_records, dtype=np.int8)
+    status_codes[current_stock >= data['Max_Stock'] * 0.9] = 2
+    status_codes[current_stock <= data['Reorder_Level']] = 1
+    data['Stock_Status'] = pd.Categorical.from_codes(status_codes, ['Normal', 'Low Stock', 'Overstocked'])
+    
+    # Construct the frame once from the complete column mapping
+    return pd.DataFrame(data)
 
 def save_sample_datasets():
     """Generate and save all sample datasets"""
@@ -1,7 +1,35 @@
 import pandas as pd
-import sqlite3
-from sqlalchemy import create_engine
-import os
+import re
+import sys
+import weakref
+from collections import OrderedDict
+
+from config import SAMPLE_SIZE_FOR_AI
+
+# Compiled once at import; word boundaries keep identifiers like UPDATED_AT from matching
+_DANGEROUS_SQL_RE = re.compile(
+    r'\b(DROP|DELETE|UPDATE|INSERT|ALTER|CREATE|TRUNCATE|GRANT|REVOKE|EXEC)\b', re.IGNORECASE
+)
+_SELECT_RE = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+
+_FRAME_CACHE_SIZE = 8
+_quality_report_cache = OrderedDict()
+_prompt_prefix_cache = OrderedDict()
+
+def _cached_for_frame(cache, df, compute):
+    """Return compute(df), memoised in a small LRU keyed by (id, shape, columns) of the DataFrame"""
+    key = (id(df), df.shape, tuple(df.columns))
+    hit = cache.get(key)
+    # The weakref guards against a new frame reusing the id of one that was garbage collected
+    if hit is not None and hit[0]() is df:
+        cache.move_to_end(key)
+        return hit[1]
+    
+    value = compute(df)
+    cache[key] = (weakref.ref(df), value)
+    if len(cache) > _FRAME_CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
 
 class DatabaseManager:
     """Utility class for managing database connections and operations"""
@@ -13,6 +41,8 @@ class DatabaseManager:
     def create_sqlite_database(self, db_path, data_dict):
         """Create SQLite database from dictionary of DataFrames"""
         try:
+            from sqlalchemy import create_engine
+            
             engine = create_engine(f'sqlite:///{db_path}')
             
             for table_name, df in data_dict.items():
@@ -25,41 +55,23 @@ class DatabaseManager:
     def get_table_info(self, engine):
         """Get information about tables in the database"""
         try:
-            with engine.connect() as conn:
-                # For SQLite
-                if 'sqlite' in str(engine.url):
-                    tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
-                    return [table[0] for table in tables]
-                # For PostgreSQL
-                elif 'postgresql' in str(engine.url):
-                    tables = conn.execute("""
-                        SELECT table_name FROM information_schema.tables 
-                        WHERE table_schema = 'public'
-                    """).fetchall()
-                    return [table[0] for table in tables]
-                # For MySQL
-                elif 'mysql' in str(engine.url):
-                    tables = conn.execute("SHOW TABLES").fetchall()
-                    return [table[0] for table in tables]
+            from sqlalchemy import inspect
+            
+            # The dialect's reflection covers every backend and its default schema
+            return inspect(engine).get_table_names()
         except Exception as e:
             print(f"Error getting table info: {e}")
             return []
     
     def validate_sql_query(self, query):
         """Basic SQL query validation"""
-        # Remove comments and extra whitespace
-        query = query.strip()
-        
         # Check for potentially dangerous operations
-        dangerous_keywords = ['DROP', 'DELETE', 'UPDATE', 'INSERT', 'ALTER', 'CREATE']
-        query_upper = query.upper()
-        
-        for keyword in dangerous_keywords:
-            if keyword in query_upper:
-                return False, f"Query contains potentially dangerous keyword: {keyword}"
+        match = _DANGEROUS_SQL_RE.search(query)
+        if match:
+            return False, f"Query contains potentially dangerous keyword: {match.group(1).upper()}"
         
         # Check if it starts with SELECT
-        if not query_upper.startswith('SELECT'):
+        if not _SELECT_RE.match(query):
             return False, "Only SELECT queries are allowed"
         
         return True, "Query is valid"
@@ -70,43 +82,59 @@ class DataProcessor:
     @staticmethod
     def clean_data(df):
         """Basic data cleaning operations"""
-        cleaned_df = df.copy()
-        
-        # Remove duplicate rows
-        initial_rows = len(cleaned_df)
-        cleaned_df = cleaned_df.drop_duplicates()
-        duplicates_removed = initial_rows - len(cleaned_df)
-        
-        # Convert string columns that look like numbers
-        for col in cleaned_df.columns:
-            if cleaned_df[col].dtype == 'object':
-                # Try to convert to numeric
-                numeric_series = pd.to_numeric(cleaned_df[col], errors='coerce')
-                if not numeric_series.isna().all():
-                    cleaned_df[col] = numeric_series
-        
-        return cleaned_df, duplicates_removed
+        # Remove duplicate rows (drop_duplicates already returns a new frame, no copy needed)
+        dedup = df.drop_duplicates(ignore_index=True)
+        duplicates_removed = len(df) - len(dedup)
+        
+        # Convert string columns that look like numbers; dedup is already a fresh frame, so set
+        # columns in place by position (works for any label and skips the chained-assignment check)
+        for i, dtype in enumerate(dedup.dtypes):
+            if dtype == 'object':
+                numeric_series = pd.to_numeric(dedup.iloc[:, i], errors='coerce')
+                if numeric_series.notna().any():
+                    dedup.isetitem(i, numeric_series)
+        
+        return dedup, duplicates_removed
     
     @staticmethod
     def get_data_quality_report(df):
-        """Generate data quality report"""
+        """Generate data quality report, reusing the cached one while the DataFrame is unchanged in shape"""
+        return _cached_for_frame(_quality_report_cache, df, DataProcessor._build_quality_report)
+    
+    @staticmethod
+    def _build_quality_report(df):
+        """Compute the data quality report from scratch"""
+        total_rows = len(df)
+        
+        # One block-wise null count; the percentages are derived from it rather than rescanning
+        missing = df.isna().sum()
+        missing_values = missing.to_dict()
+        missing_percentage = (missing / total_rows * 100).to_dict() if total_rows else dict.fromkeys(missing_values, 0.0)
+        
         report = {
-            'total_rows': len(df),
+            'total_rows': total_rows,
             'total_columns': len(df.columns),
-            'missing_values': df.isnull().sum().to_dict(),
+            'missing_values': missing_values,
             'data_types': df.dtypes.to_dict(),
-            'memory_usage': df.memory_usage(deep=True).sum(),
-            'duplicate_rows': df.duplicated().sum()
-        }
-        
-        # Calculate missing percentage
-        report['missing_percentage'] = {
-            col: (missing / len(df)) * 100 
-            for col, missing in report['missing_values'].items()
+            'memory_usage': DataProcessor._estimate_memory_usage(df),
+            'duplicate_rows': int(df.duplicated().sum()),
+            'missing_percentage': missing_percentage
         }
         
         return report
     
+    @staticmethod
+    def _estimate_memory_usage(df, sample_size=64):
+        """Shallow memory usage plus a sampled estimate of the Python objects held by object columns"""
+        total = int(df.memory_usage(deep=False).sum())
+        if len(df) == 0:
+            return total
+        
+        for col in df.select_dtypes(include='object').columns:
+            sample = df[col].head(sample_size)
+            total += int(sample.map(sys.getsizeof).mean() * len(df))
+        return total
+    
     @staticmethod
     def suggest_visualizations(df):
         """Suggest appropriate visualizations based on data types"""
@@ -174,9 +202,28 @@ class AIPromptGenerator:
     @staticmethod
     def generate_analysis_prompt(df, user_question):
         """Generate a comprehensive prompt for data analysis"""
+        # Only the question changes between turns; the dataset part is built once per DataFrame
+        prefix = _cached_for_frame(_prompt_prefix_cache, df, AIPromptGenerator._build_prompt_prefix)
+        
+        prompt = prefix + f"""User Question: {user_question}
+        
+        Please provide:
+        1. A direct answer to the user's question
+        2. Relevant insights from the data
+        3. Suggested next steps or additional analysis
+        4. If applicable, suggest SQL queries or visualizations
+        
+        Be specific and actionable in your response.
+        """
+        
+        return prompt
+    
+    @staticmethod
+    def _build_prompt_prefix(df):
+        """Render the dataset overview and sample rows that open the analysis prompt"""
         data_summary = DataProcessor.get_data_quality_report(df)
         
-        prompt = f"""
+        return f"""
         As an expert data analyst, please analyze this dataset and answer the user's question.
         
         Dataset Overview:
@@ -186,21 +233,10 @@ class AIPromptGenerator:
         - Data types: {data_summary['data_types']}
         - Missing values: {data_summary['missing_values']}
         
-        Sample data (first 5 rows):
-        {df.head().to_string()}
-        
-        User Question: {user_question}
+        Sample data (first {SAMPLE_SIZE_FOR_AI} rows, CSV):
+        {df.head(SAMPLE_SIZE_FOR_AI).to_csv(index=False)}
         
-        Please provide:
-        1. A direct answer to the user's question
-        2. Relevant insights from the data
-        3. Suggested next steps or additional analysis
-        4. If applicable, suggest SQL queries or visualizations
-        
-        Be specific and actionable in your response.
         """
-        
-        return prompt
     
     @staticmethod
     def generate_sql_from_natural_language(df, natural_query):